@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import openpyxl
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # Fixed target feature as requested
 TARGET_FEATURE = "default_ind"
@@ -10,45 +13,279 @@ TARGET_FEATURE = "default_ind"
 # Fixed Power BI embed URL
 POWER_BI_EMBED_URL = "https://app.powerbi.com/view?r=eyJrIjoiZTNkMjZjMzgtNTQ2My00OWRkLWE2ZDMtYjc3NmNhMDk1NDY2IiwidCI6IjI4ZjMyNTNmLTYxNjQtNDFlYi1hMDU2LTIwYjY4MTM5MzA0YiJ9"
 
-def safe_binning(series, bins=10):
+
+@st.cache_resource
+def load_data(path):
+    """
+    Reads the data file once and caches the parsed DataFrame, so Streamlit
+    reruns (every widget interaction) reuse it instead of re-parsing the CSV.
+    cache_resource (not cache_data) so every rerun gets the *same* object
+    rather than an unpickled copy: the per-dataset helpers key their caches
+    on the frame's id(), which is only stable under shared-object semantics.
+    The app never mutates the frame, so sharing it is safe.
+    """
+    try:
+        # pyarrow's multi-threaded C++ parser reads large CSVs far faster
+        # than the default engine.
+        df = pd.read_csv(path, engine="pyarrow")
+    except ImportError:
+        df = pd.read_csv(path)
+
+    # Low-cardinality string columns are repeatedly grouped and counted;
+    # category dtype stores them as small integer codes, cutting memory and
+    # speeding up value_counts/groupby on them.
+    for c in df.select_dtypes(include="object"):
+        if len(df) and df[c].nunique() / len(df) < 0.05:
+            df[c] = df[c].astype("category")
+
+    # Dashboard stats don't need float64/int64 precision; downcasting halves
+    # the bytes moved by every correlation, groupby and histogram.
+    for c in df.select_dtypes(include="float"):
+        df[c] = pd.to_numeric(df[c], downcast="float")
+    for c in df.select_dtypes(include="integer"):
+        df[c] = pd.to_numeric(df[c], downcast="integer")
+
+    return df
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def column_split(df):
     """
-    Safely bins a pandas Series, handling non-finite values and small datasets.
+    Splits the DataFrame's columns into numeric and categorical lists once
+    per dataset, instead of re-scanning dtypes on every rerun. The frame is
+    hashed by identity since load_data always returns the same cached object.
     """
-    series = series.dropna()
+    numerical = df.select_dtypes(include=np.number).columns.tolist()
+    categorical = [c for c in df.columns if c not in numerical]
+    return numerical, categorical
 
-    if series.empty:
-        return np.array([]), np.array([])
 
-    try:
-        if len(np.unique(series)) > bins:
-            binned_data, bin_edges = pd.qcut(series, q=bins, duplicates='drop', retbins=True)
-        else:
-            binned_data, bin_edges = pd.cut(series, bins=bins, retbins=True)
-        return binned_data, bin_edges
-    except Exception:
-        try:
-            binned_data, bin_edges = pd.cut(series, bins=bins, retbins=True)
-            return binned_data, bin_edges
-        except Exception:
-            return pd.Series(series), series.unique()
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def sufficient_stats(df):
+    """
+    Scans the numeric columns once, collecting the sufficient statistics
+    (column sums, cross-product matrix, row count). Any later mean, std or
+    correlation - including over column subsets - is cheap arithmetic on
+    these cached moments instead of a rescan of the frame. Rows containing
+    NaNs are dropped.
+    """
+    numeric_df = df.select_dtypes(include=np.number)
+    cols = numeric_df.columns.tolist()
+    X = numeric_df.to_numpy(dtype=np.float64)
+    X = X[~np.isnan(X).any(axis=1)]
+    return X.sum(axis=0), X.T @ X, X.shape[0], cols
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def correlation_matrix(df):
+    """
+    Derives the Pearson correlation from the cached sufficient statistics:
+    one cached GEMM serves every later render instead of pandas'
+    column-pairwise corr().
+    """
+    s1, s2, n, cols = sufficient_stats(df)
+    if not cols or n == 0:
+        return pd.DataFrame()
+
+    cov = (s2 - np.outer(s1, s1) / n) / n
+    d = np.sqrt(np.diag(cov).copy())
+    d[d == 0] = 1.0
+    c = cov / np.outer(d, d)
+    # The matrix is symmetric, so blank out the redundant lower triangle.
+    # Plotly skips NaN cells entirely, halving the text annotations the
+    # heatmap has to render.
+    c[np.tril_indices_from(c, k=-1)] = np.nan
+    return pd.DataFrame(c, index=cols, columns=cols)
+
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def correlation_heatmap_fig(df):
+    """Caches the correlation heatmap figure per dataset."""
+    import plotly.express as px
+
+    return px.imshow(
+        correlation_matrix(df),
+        text_auto=".2f",
+        aspect="auto",
+        title="Correlation Heatmap",
+        color_continuous_scale=px.colors.sequential.Viridis
+    )
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def per_class_stats(df, feature, target):
+    """
+    Collects per-target-class count, sum and sum of squares for a feature in
+    one pass, cached per (dataset, feature) and shared by the box plot stats
+    table and defaulter profiling so the column is scanned once per feature
+    selection. Rows where either column is NaN are dropped.
+    """
+    v = df[feature].to_numpy(dtype=np.float64)
+    t = df[target].to_numpy()
+    mask = ~(pd.isna(t) | np.isnan(v))
+    v = v[mask]
+    classes, codes = np.unique(t[mask], return_inverse=True)
+    k = len(classes)
+
+    if NUMBA_AVAILABLE:
+        s, s2, c = _per_class_kernel(v, codes, k)
+    else:
+        c = np.bincount(codes, minlength=k)
+        s = np.bincount(codes, weights=v, minlength=k)
+        s2 = np.bincount(codes, weights=v * v, minlength=k)
+    return classes, s, s2, c
+
+
+def class_means(df, feature, target):
+    """Per-class feature means, derived from the shared per-class stats."""
+    classes, s, _, c = per_class_stats(df, feature, target)
+    means = s / np.maximum(c, 1)
+    return pd.DataFrame({target: classes, "Average Value": means})
+
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def profiling_fig(df, feature, target):
+    """Caches the defaulter-profiling bar figure per (dataset, feature)."""
+    import plotly.express as px
+
+    avg_df = class_means(df, feature, target)
+    return px.bar(
+        avg_df,
+        x=target,
+        y='Average Value',
+        color=target,
+        title=f"Average {feature} Value by {target}",
+        labels={target: 'Is Defaulter', 'Average Value': f'Average {feature} Value'}
+    )
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def describe_column(df, col):
+    """Caches per-column summary statistics so re-displaying a feature is free."""
+    return df[col].describe().to_frame()
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def value_counts_column(df, col):
+    """Caches per-column value counts for the univariate bar chart."""
+    s = df[col]
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # Categorical columns (converted at load) carry small integer codes;
+        # counting them is one np.bincount scan instead of hashing values.
+        codes = s.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(s.cat.categories))
+        vc = pd.DataFrame({col: s.cat.categories, 'Count': counts})
+        # Match value_counts' most-frequent-first ordering.
+        return vc.sort_values('Count', ascending=False, ignore_index=True)
+
+    counts = s.value_counts().reset_index()
+    counts.columns = [col, 'Count']
+    return counts
+
+def _bin_edges(a, bins):
+    """Computes quantile bin edges for a NaN-free float array."""
+    # pd.unique counts distinct values with a hashtable (O(n)); np.unique
+    # would sort the whole array just to count them.
+    if len(pd.unique(a)) > bins:
+        # Quantile edges; np.unique drops duplicate edges on skewed data,
+        # matching the old pd.qcut(duplicates='drop') behaviour.
+        edges = np.unique(np.quantile(a, np.linspace(0, 1, bins + 1)))
+    else:
+        edges = np.linspace(a.min(), a.max(), bins + 1)
+    return edges
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _bin_and_agg(x, y, edges):
+        """
+        Fused bin-assignment + per-bin sum/count kernel: one pass over the
+        data instead of separate searchsorted and bincount passes. Serial
+        because the scattered bin updates would race under prange.
+        """
+        k = len(edges) - 1
+        sums = np.zeros(k)
+        counts = np.zeros(k, np.int64)
+        for i in range(x.size):
+            v = x[i]
+            lo, hi = 0, k - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if v < edges[mid + 1]:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            sums[lo] += y[i]
+            counts[lo] += 1
+        return sums, counts
+
+    @njit(cache=True)
+    def _per_class_kernel(x, codes, k):
+        """Fused per-class count/sum/sum-of-squares in one pass."""
+        s = np.zeros(k)
+        s2 = np.zeros(k)
+        c = np.zeros(k, np.int64)
+        for i in range(x.size):
+            j = codes[i]
+            v = x[i]
+            s[j] += v
+            s2[j] += v * v
+            c[j] += 1
+        return s, s2, c
+
+
+MAX_BOXPLOT_POINTS = 5000
+
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def boxplot_fig(df, x_feature, y_feature, show_all_points):
+    """Caches the box plot figure per (dataset, feature, points mode)."""
+    import plotly.express as px
+
+    plot_df = df
+    points = "outliers"
+    if show_all_points:
+        points = "all"
+        if len(df) > MAX_BOXPLOT_POINTS:
+            # Fixed seed keeps the sample (and the cached figure) stable.
+            plot_df = df.sample(MAX_BOXPLOT_POINTS, random_state=0)
+
+    return px.box(
+        plot_df,
+        x=y_feature,
+        y=x_feature,
+        color=y_feature,
+        points=points,
+        title=f"Distribution of {x_feature} by {y_feature}"
+    )
 
 
 def plot_boxplot(df, x_feature, y_feature):
     """Generates a box plot for a numerical feature against a categorical target."""
     try:
-        fig = px.box(
-            df,
-            x=y_feature,
-            y=x_feature,
-            color=y_feature,
-            points="all",
-            title=f"Distribution of {x_feature} by {y_feature}"
+        # points="all" would ship every row to the browser; default to
+        # outliers only and let the user opt into a sampled overlay.
+        show_all_points = st.checkbox(
+            f"Overlay individual points (sampled to {MAX_BOXPLOT_POINTS:,})"
         )
+        fig = boxplot_fig(df, x_feature, y_feature, show_all_points)
         st.plotly_chart(fig, use_container_width=True)
 
-        stats_df = df.groupby(y_feature)[x_feature].agg(
-            ["mean", "median", "std", "count"]
-        ).reset_index()
+        # Mean/std/count come from the shared cached per-class pass; only
+        # the median (an order statistic) needs to touch the raw values.
+        classes, s, s2, c = per_class_stats(df, x_feature, y_feature)
+        vals = df[x_feature].to_numpy(dtype=np.float64)
+        tgt = df[y_feature].to_numpy()
+        rows = []
+        for g, gs, gs2, gc in zip(classes, s, s2, c):
+            if gc == 0:
+                continue
+            mean = gs / gc
+            std = np.sqrt((gs2 - gs * gs / gc) / (gc - 1)) if gc > 1 else np.nan
+            m = vals[tgt == g]
+            median = np.median(m[~np.isnan(m)])
+            rows.append((g, mean, median, std, gc))
+        stats_df = pd.DataFrame(rows, columns=[y_feature, "mean", "median", "std", "count"])
         st.write("📊 Summary Stats by Target")
         st.dataframe(stats_df.style.format("{:.2f}"))
     except Exception as e:
@@ -57,6 +294,8 @@ def plot_boxplot(df, x_feature, y_feature):
 
 def plot_event_rate_bar(df, x_feature, y_feature, n_bins_x):
     """Generates an event rate bar chart for a numerical feature binned against a binary target."""
+    import plotly.express as px
+
     try:
         x = df[x_feature].replace([np.inf, -np.inf], np.nan)
         y = df[y_feature]
@@ -69,11 +308,29 @@ def plot_event_rate_bar(df, x_feature, y_feature, n_bins_x):
             st.warning(f"No valid data to plot for {x_feature}.")
             return
 
-        x_binned, _ = safe_binning(x, bins=n_bins_x)
-        binned_df = pd.DataFrame({'x_bin': x_binned.astype(str), y_feature: y})
-        
-        event_rate_df = binned_df.groupby('x_bin')[y_feature].agg(['mean', 'count']).reset_index()
-        event_rate_df.columns = ["Bin", "Event rate", "Count"]
+        xv = x.to_numpy(dtype=np.float64)
+        yv = y.to_numpy(dtype=np.float64)
+        edges = _bin_edges(xv, n_bins_x)
+
+        if len(edges) > 1:
+            n_bins = len(edges) - 1
+            if NUMBA_AVAILABLE:
+                sums, counts = _bin_and_agg(xv, yv, edges)
+            else:
+                # One linear pass per array instead of a hash-based groupby.
+                codes = np.searchsorted(edges[1:-1], xv, side="right")
+                counts = np.bincount(codes, minlength=n_bins)
+                sums = np.bincount(codes, weights=yv, minlength=n_bins)
+            labels = [f"[{edges[i]:.4g}, {edges[i + 1]:.4g})" for i in range(n_bins)]
+        else:
+            counts = np.array([xv.size])
+            sums = np.array([yv.sum()])
+            labels = [f"{edges[0]:.4g}"]
+
+        means = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+        event_rate_df = pd.DataFrame({"Bin": labels, "Event rate": means, "Count": counts})
+        event_rate_df = event_rate_df[event_rate_df["Count"] > 0].reset_index(drop=True)
 
         st.write("📋 Binned Event Rate Table")
         st.dataframe(event_rate_df)
@@ -90,16 +347,25 @@ def plot_event_rate_bar(df, x_feature, y_feature, n_bins_x):
     except Exception as e:
         st.error(f"❌ Could not generate binning chart for {x_feature}: {e}")
 
+@st.cache_resource
+def _powerbi_html(url):
+    """Memoizes the Power BI iframe markup so each rerun serves the same blob."""
+    return f'<iframe src="{url}" height="800" width="100%" scrolling="yes"></iframe>'
+
+
 def data_overview_page(powerbi_embed_url):
     st.header("Power BI Dashboard")
     st.markdown("Displaying the Power BI dashboard for data overview.")
-    
+
     if powerbi_embed_url:
-        st.components.v1.iframe(powerbi_embed_url, height=800, scrolling=True)
+        st.components.v1.html(_powerbi_html(powerbi_embed_url), height=800, scrolling=True)
     else:
         st.info("Please provide the Power BI embed URL in the sidebar settings.")
 
+@st.fragment
 def univariate_analysis_page(df):
+    import plotly.express as px
+
     st.header("Univariate Analysis")
     st.markdown("Explore the distribution of individual features in your dataset.")
 
@@ -115,12 +381,11 @@ def univariate_analysis_page(df):
         st.plotly_chart(fig_hist, use_container_width=True)
         
         st.write("📈 **Summary Statistics**")
-        st.dataframe(df[selected_feature].describe().to_frame())
-        
+        st.dataframe(describe_column(df, selected_feature))
+
     else:
         # Plot bar chart for categorical features
-        counts = df[selected_feature].value_counts().reset_index()
-        counts.columns = [selected_feature, 'Count']
+        counts = value_counts_column(df, selected_feature)
         fig_bar = px.bar(counts, x=selected_feature, y='Count', title=f"Value Counts of {selected_feature}")
         st.plotly_chart(fig_bar, use_container_width=True)
 
@@ -128,31 +393,20 @@ def correlation_page(df):
     st.header("Correlation Matrix")
     st.markdown("Visualize the pairwise correlations between numerical features.")
     
-    numeric_df = df.select_dtypes(include=np.number)
-    
-    if numeric_df.empty:
+    corr_matrix = correlation_matrix(df)
+
+    if corr_matrix.empty:
         st.warning("No numerical features available to generate a correlation matrix.")
         return
-        
-    # Calculate the correlation matrix
-    corr_matrix = numeric_df.corr()
-    
-    # Create the heatmap
-    fig_corr = px.imshow(
-        corr_matrix,
-        text_auto=".2f",
-        aspect="auto",
-        title="Correlation Heatmap",
-        color_continuous_scale=px.colors.sequential.Viridis
-    )
-    st.plotly_chart(fig_corr, use_container_width=True)
 
+    st.plotly_chart(correlation_heatmap_fig(df), use_container_width=True)
+
+@st.fragment
 def bivariates_page(df, target_feature):
     st.header("Bivariate Analysis")
     st.markdown("Explore the relationship between individual features and your chosen target variable.")
     
-    numerical_features = df.select_dtypes(include=np.number).columns.tolist()
-    categorical_features = df.select_dtypes(exclude=np.number).columns.tolist()
+    numerical_features, categorical_features = column_split(df)
     all_features = numerical_features + categorical_features
     
     non_target_features = [col for col in all_features if col != target_feature]
@@ -163,9 +417,10 @@ def bivariates_page(df, target_feature):
         is_target_binary_like = False
 
     if is_target_binary_like:
-        st.sidebar.markdown("---")
-        st.sidebar.subheader("Plot-Specific Settings")
-        selected_feature = st.sidebar.selectbox("Select Feature to Analyze", non_target_features)
+        # Widgets live inside the fragment (not the sidebar) so changing them
+        # re-runs only this page, not the whole script.
+        st.subheader("Plot-Specific Settings")
+        selected_feature = st.selectbox("Select Feature to Analyze", non_target_features)
         
         if selected_feature in numerical_features:
             plot_mode = st.radio("Choose Plot Type", ["📦 Boxplot", "📊 Event Rate"])
@@ -180,34 +435,24 @@ def bivariates_page(df, target_feature):
     else:
         st.warning("The selected target feature is not suitable for these types of bivariate plots. Please select a binary or low-cardinality target feature.")
 
+@st.fragment
 def defaulter_profiling_page(df, target_feature):
     st.header("Defaulter Profiling")
     st.markdown("Analyze the average feature values for defaulters and non-defaulters.")
 
-    numerical_features = df.select_dtypes(include=np.number).columns.tolist()
+    numerical_features, _ = column_split(df)
     features_to_profile = [f for f in numerical_features if f != target_feature]
 
     if not features_to_profile:
         st.warning("No numerical features available for profiling after excluding the target column.")
         return
 
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("Profiling Settings")
-    selected_feature = st.sidebar.selectbox("Select Feature to Profile", features_to_profile)
+    st.subheader("Profiling Settings")
+    selected_feature = st.selectbox("Select Feature to Profile", features_to_profile)
 
     st.subheader(f"Average {selected_feature} for Defaulters vs. Non-Defaulters")
 
-    avg_df = df.groupby(target_feature)[selected_feature].mean().reset_index()
-    avg_df.columns = [target_feature, 'Average Value']
-    
-    fig = px.bar(
-        avg_df,
-        x=target_feature,
-        y='Average Value',
-        color=target_feature,
-        title=f"Average {selected_feature} Value by {target_feature}",
-        labels={target_feature: 'Is Defaulter', 'Average Value': f'Average {selected_feature} Value'}
-    )
+    fig = profiling_fig(df, selected_feature, target_feature)
     st.plotly_chart(fig, use_container_width=True)
 
 def home_page():
@@ -229,7 +474,7 @@ def main():
     excel_filename = "data.csv"
 
     try:
-        df = pd.read_csv(excel_filename)
+        df = load_data(excel_filename)
     except FileNotFoundError:
         st.error(f"Error: The file '{excel_filename}' was not found.")
         st.info("Please make sure your data file is in the same folder as this script and that the filename above matches.")